@@ -1,25 +1,57 @@
 import asyncio
 import base64
 import datetime
+import heapq
+import html
+import operator
 import os
 import httpx
 import streamlit as st
 import threading
-import requests
-import re
+import time
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import chain
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from hume.client import AsyncHumeClient
 from hume.empathic_voice.chat.socket_client import ChatConnectOptions
 from hume.empathic_voice.chat.types import SubscribeEvent
 from hume import MicrophoneInterface, Stream
 
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 # Disable SSL verification for corporate networks
 os.environ['PYTHONHTTPSVERIFY'] = '0'
 os.environ['CURL_CA_BUNDLE'] = ''
 
-def translate_text(text, target_lang='ar'):
+TRANSLATE_URL = "https://translate.googleapis.com/translate_a/single"
+TRANSLATE_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+TRANSLATION_UNAVAILABLE = "Translation unavailable"
+TRANSLATION_PENDING = "…"
+TRANSLATION_BATCH_SIZE = 8
+TRANSLATION_BATCH_WAIT = 0.15  # seconds
+TRANSLATION_DRAIN_TIMEOUT = 5  # seconds
+CHAT_HISTORY_MAX = 500
+CHAT_VISIBLE_COUNT = 50
+CHAT_REFRESH_TIMEOUT = 2  # seconds
+
+_get_score = operator.itemgetter(1)
+# Free-text entry fields that get a pre-escaped "<field>_safe" copy for rendering
+_ESCAPED_FIELDS = ("message", "english_translation", "arabic_translation")
+
+_TRANSLATION_CACHE_SIZE = 2048
+_TRANSLATION_CACHE_TTL = 24 * 60 * 60  # seconds
+_translation_cache = OrderedDict()
+_translation_cache_lock = threading.Lock()
+
+async def _translate_uncached(client, text, target_lang):
     """Simple translation using Google Translate API"""
     try:
-        url = "https://translate.googleapis.com/translate_a/single"
         params = {
             'client': 'gtx',
             'sl': 'auto',
@@ -27,37 +59,93 @@ def translate_text(text, target_lang='ar'):
             'dt': 't',
             'q': text
         }
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, params=params, headers=headers, timeout=10)
+        response = await client.get(TRANSLATE_URL, params=params, headers=TRANSLATE_HEADERS, timeout=10)
         
         if response.status_code == 200:
             result = response.json()
             if result and result[0]:
                 return ''.join([item[0] for item in result[0] if item and item[0]]).strip()
-    except:
+    except Exception:
         pass
-    return "Translation unavailable"
+    return TRANSLATION_UNAVAILABLE
+
+def _cache_key(text, target_lang):
+    return (" ".join(text.split()).lower(), target_lang)
+
+def _cache_get(key):
+    with _translation_cache_lock:
+        cached = _translation_cache.get(key)
+        if cached is None:
+            return None
+        value, expires_at = cached
+        if expires_at < time.monotonic():
+            del _translation_cache[key]
+            return None
+        _translation_cache.move_to_end(key)
+        return value
+
+def _cache_put(key, value):
+    # Failures and empty results are never memoized so they get retried
+    if not value or value == TRANSLATION_UNAVAILABLE:
+        return
+    with _translation_cache_lock:
+        _translation_cache[key] = (value, time.monotonic() + _TRANSLATION_CACHE_TTL)
+        _translation_cache.move_to_end(key)
+        while len(_translation_cache) > _TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+
+def _should_translate(text):
+    """Skip the round trip for text with nothing to translate"""
+    return len(text.strip()) >= 2 and any(c.isalpha() for c in text)
+
+async def translate_text_async(client, text, target_lang='ar'):
+    """Translate text, reusing recent results for repeated phrases"""
+    if not text or not text.strip():
+        return await _translate_uncached(client, text, target_lang)
+    key = _cache_key(text, target_lang)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+    result = await _translate_uncached(client, text, target_lang)
+    _cache_put(key, result)
+    return result
+
+_ARABIC_CODEPOINTS = frozenset(chain(range(0x0600, 0x0700), range(0x0750, 0x0780), range(0x08A0, 0x0900)))
 
+@lru_cache(maxsize=256)
 def is_arabic(text):
     """Check if text contains Arabic characters"""
-    arabic_pattern = re.compile(r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]')
-    arabic_chars = len(arabic_pattern.findall(text))
-    total_chars = len([c for c in text if c.isalpha()])
-    return total_chars > 0 and arabic_chars / total_chars > 0.3
+    arabic_chars = total_chars = 0
+    for c in text:
+        if c.isalpha():
+            total_chars += 1
+        if ord(c) in _ARABIC_CODEPOINTS:
+            arabic_chars += 1
+    return total_chars > 0 and arabic_chars * 10 > total_chars * 3
+
+def _escape_html(text):
+    return html.escape(text).replace('\n', '<br>')
 
 class StreamlitWebSocketHandler:
     def __init__(self, input_language='auto'):
         self.byte_strs = Stream.new()
-        self.chat_history = []
+        self.chat_history = deque(maxlen=CHAT_HISTORY_MAX)
+        self._lock = threading.Lock()
+        self._new_msg_event = threading.Event()
         self.is_connected = False
         self.input_language = input_language
+        self.http_client = None
+        self._xlate_queue = None
+        self._xlate_task = None
 
     def set_input_language(self, language):
         self.input_language = language
 
     async def on_open(self):
         self.is_connected = True
-        self.chat_history.append({
+        self._xlate_queue = asyncio.Queue()
+        self._xlate_task = asyncio.create_task(self._translation_worker())
+        self.add_entry({
             "timestamp": datetime.datetime.now(tz=datetime.timezone.utc),
             "type": "system",
             "message": "🎤 Audio connection established. Start speaking now!"
@@ -67,7 +155,7 @@ class StreamlitWebSocketHandler:
         timestamp = datetime.datetime.now(tz=datetime.timezone.utc)
         
         if message.type == "user_message":
-            emotions = self._extract_top_n_emotions(dict(message.models.prosody.scores), 3) if message.models.prosody else {}
+            emotions = self._extract_top_n_emotions(message.models.prosody.scores, 3) if message.models.prosody else {}
             text = message.message.content.strip()
             
             # Determine language
@@ -85,17 +173,20 @@ class StreamlitWebSocketHandler:
                 "original_language": "arabic" if detected_is_arabic else "english"
             }
             
-            # Add translation
+            # Add translation placeholder, filled in by the translation worker
             if detected_is_arabic:
-                chat_entry["english_translation"] = translate_text(text, 'en')
+                field, target_lang = "english_translation", 'en'
             else:
-                chat_entry["arabic_translation"] = translate_text(text, 'ar')
-            
-            self.chat_history.append(chat_entry)
+                field, target_lang = "arabic_translation", 'ar'
+            needs_translation = _should_translate(text)
+            chat_entry[field] = TRANSLATION_PENDING if needs_translation else text
+            self.add_entry(chat_entry)
+            if needs_translation:
+                await self._xlate_queue.put((chat_entry, field, text, target_lang))
             
         elif message.type == "assistant_message":
-            emotions = self._extract_top_n_emotions(dict(message.models.prosody.scores), 3) if message.models.prosody else {}
-            self.chat_history.append({
+            emotions = self._extract_top_n_emotions(message.models.prosody.scores, 3) if message.models.prosody else {}
+            self.add_entry({
                 "timestamp": timestamp,
                 "type": "assistant",
                 "message": message.message.content,
@@ -103,10 +194,11 @@ class StreamlitWebSocketHandler:
             })
             
         elif message.type == "audio_output":
-            await self.byte_strs.put(base64.b64decode(message.data.encode("utf-8")))
+            # Each payload is a complete WAV clip, so frames are queued one by one
+            await self.byte_strs.put(base64.b64decode(message.data))
             
         elif message.type == "error":
-            self.chat_history.append({
+            self.add_entry({
                 "timestamp": timestamp,
                 "type": "error",
                 "message": f"Error ({message.code}): {message.message}"
@@ -114,29 +206,126 @@ class StreamlitWebSocketHandler:
 
     async def on_close(self):
         self.is_connected = False
-        self.chat_history.append({
+        if self._xlate_task is not None:
+            # Let queued translations finish, then give up on whatever is left
+            await self._xlate_queue.put(None)
+            try:
+                await asyncio.wait_for(self._xlate_task, TRANSLATION_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            self._xlate_task = None
+            self._fail_pending_translations()
+        self.add_entry({
             "timestamp": datetime.datetime.now(tz=datetime.timezone.utc),
             "type": "system",
             "message": "🔇 Audio connection closed."
         })
 
     async def on_error(self, error):
-        self.chat_history.append({
+        self.add_entry({
             "timestamp": datetime.datetime.now(tz=datetime.timezone.utc),
             "type": "error",
             "message": f"Audio Error: {error}"
         })
 
-    def _extract_top_n_emotions(self, emotion_scores: dict, n: int) -> dict:
-        sorted_emotions = sorted(emotion_scores.items(), key=lambda item: item[1], reverse=True)
-        return {emotion: score for emotion, score in sorted_emotions[:n]}
+    async def _translation_worker(self):
+        # A None item marks the end of the session
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            item = await self._xlate_queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + TRANSLATION_BATCH_WAIT
+            while len(batch) < TRANSLATION_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._xlate_queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            await self._translate_batch(batch)
+
+    async def _translate_batch(self, batch):
+        # Identical phrases in the same batch are only translated once
+        pending = {}
+        for entry, field, text, target_lang in batch:
+            pending.setdefault((text, target_lang), []).append((entry, field))
+        results = await asyncio.gather(*(
+            translate_text_async(self.http_client, text, target_lang)
+            for text, target_lang in pending
+        ))
+        updates = {}
+        for targets, result in zip(pending.values(), results):
+            for entry, field in targets:
+                fields = updates.setdefault(id(entry), {})
+                fields[field] = result
+                fields[field + "_safe"] = _escape_html(result)
+        self._patch_entries(lambda entry: updates.get(id(entry)))
+
+    def _fail_pending_translations(self):
+        unavailable = _escape_html(TRANSLATION_UNAVAILABLE)
+        def patch(entry):
+            fields = {}
+            for field in ("english_translation", "arabic_translation"):
+                if entry.get(field) == TRANSLATION_PENDING:
+                    fields[field] = TRANSLATION_UNAVAILABLE
+                    fields[field + "_safe"] = unavailable
+            return fields
+        self._patch_entries(patch)
+
+    def _patch_entries(self, patch):
+        # Patched entries are swapped for fresh copies so the UI thread never
+        # caches markup for a dict that is changing underneath it
+        with self._lock:
+            for i, entry in enumerate(self.chat_history):
+                fields = patch(entry)
+                if fields:
+                    self.chat_history[i] = {**entry, **fields, '_html': None}
+        self._new_msg_event.set()
 
-    def get_chat_history(self):
-        return self.chat_history
+    def _extract_top_n_emotions(self, scores_mapping, n: int) -> dict:
+        # Prosody scores arrive as a pydantic model, which iterates as (name, score) pairs
+        items = scores_mapping.items() if isinstance(scores_mapping, Mapping) else scores_mapping
+        return dict(heapq.nlargest(n, items, key=_get_score))
 
-async def run_voice_chat(handler, api_key, secret_key, config_id):
-    custom_client = httpx.AsyncClient(verify=False, timeout=30.0)
+    def add_entry(self, entry):
+        # Format and escape once here rather than on every render
+        entry.setdefault("timestamp_str", entry["timestamp"].strftime("%H:%M:%S"))
+        for field in _ESCAPED_FIELDS:
+            if field in entry:
+                entry[field + "_safe"] = _escape_html(entry[field])
+        with self._lock:
+            self.chat_history.append(entry)
+        self._new_msg_event.set()
+
+    def clear_history(self):
+        with self._lock:
+            self.chat_history.clear()
+        self._new_msg_event.set()
+
+    def wait_for_update(self, timeout):
+        """Block until the history changes or the timeout elapses"""
+        updated = self._new_msg_event.wait(timeout)
+        self._new_msg_event.clear()
+        return updated
+
+    def get_chat_history(self, limit=CHAT_VISIBLE_COUNT):
+        with self._lock:
+            history = list(self.chat_history)
+        return history[-limit:] if limit else history
+
+async def run_voice_chat(handler, api_key, secret_key, config_id, http_client=None):
+    owns_client = http_client is None
+    custom_client = http_client if http_client is not None else httpx.AsyncClient(verify=False, timeout=30.0)
     client = AsyncHumeClient(api_key=api_key, httpx_client=custom_client)
+    handler.http_client = custom_client
     options = ChatConnectOptions(config_id=config_id, secret_key=secret_key)
 
     try:
@@ -156,13 +345,13 @@ async def run_voice_chat(handler, api_key, secret_key, config_id):
                 # Handle audio device errors
                 error_msg = str(audio_error)
                 if "querying device" in error_msg or "No Default Input Device Available" in error_msg:
-                    handler.chat_history.append({
+                    handler.add_entry({
                         "timestamp": datetime.datetime.now(tz=datetime.timezone.utc),
                         "type": "error",
                         "message": "🚫 Microphone access denied or unavailable. This is expected on cloud servers. For full audio functionality, please run this app locally using: streamlit run app.py"
                     })
                 else:
-                    handler.chat_history.append({
+                    handler.add_entry({
                         "timestamp": datetime.datetime.now(tz=datetime.timezone.utc),
                         "type": "error", 
                         "message": f"🎤 Audio Error: {error_msg}"
@@ -173,37 +362,31 @@ async def run_voice_chat(handler, api_key, secret_key, config_id):
                     await asyncio.sleep(1)
                 
     except Exception as e:
-        handler.chat_history.append({
+        handler.add_entry({
             "timestamp": datetime.datetime.now(tz=datetime.timezone.utc),
             "type": "error",
             "message": f"Connection error: {e}"
         })
     finally:
-        await custom_client.aclose()
+        if owns_client:
+            await custom_client.aclose()
 
-def run_async_chat(handler, api_key, secret_key, config_id):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        loop.run_until_complete(run_voice_chat(handler, api_key, secret_key, config_id))
-    finally:
-        loop.close()
-
-def main():
-    st.set_page_config(page_title="Hume AI Voice Chat", page_icon="🎙️", layout="wide")
+@st.cache_resource
+def get_background_loop():
+    """Long-lived event loop on a daemon thread, shared by every voice chat in the process"""
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
 
-    # Initialize session
-    if 'session_initialized' not in st.session_state:
-        if 'websocket_handler' in st.session_state:
-            del st.session_state.websocket_handler
-        if 'chat_thread' in st.session_state:
-            del st.session_state.chat_thread
-        if 'input_language' not in st.session_state:
-            st.session_state.input_language = 'auto'
-        st.session_state.session_initialized = True
+@st.cache_resource
+def get_http_client():
+    """Shared client pool for Hume and translation requests, used only on the background loop"""
+    return httpx.AsyncClient(verify=False, timeout=30.0)
 
-    # Custom CSS
-    st.markdown("""
+@st.cache_resource
+def custom_css():
+    """Static stylesheet, built once per server process"""
+    return """
     <style>
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600&display=swap');
     
@@ -297,7 +480,114 @@ def main():
         box-shadow: 0 0 0 2px rgba(239, 68, 68, 0.2);
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+def build_html(entry):
+    """Render a chat entry as the HTML block shown in the conversation"""
+    timestamp_str = entry['timestamp_str']
+    
+    if entry['type'] == 'user':
+        css_class = "chat-container user-message"
+        role = "🗣️ You"
+    elif entry['type'] == 'assistant':
+        css_class = "chat-container assistant-message"
+        role = "🤖 AI Assistant"
+    elif entry['type'] == 'system':
+        css_class = "chat-container system-message"
+        role = "🔊 System"
+    elif entry['type'] == 'error':
+        css_class = "chat-container error-message"
+        role = "⚠️ Status"
+    else:
+        css_class = "chat-container"
+        role = entry['type'].title()
+    
+    # Build message content
+    message_content = entry['message_safe']
+    
+    # Add translation for user messages
+    if entry['type'] == 'user':
+        if entry.get('original_language') == 'arabic' and 'english_translation_safe' in entry:
+            message_content += f"<br><br>English: {entry['english_translation_safe']}"
+        elif entry.get('original_language') == 'english' and 'arabic_translation_safe' in entry:
+            message_content += f"<br><br>Arabic: {entry['arabic_translation_safe']}"
+    
+    # Add emotions
+    if 'emotions' in entry and entry['emotions']:
+        emotion_text = ' • '.join([f"{emotion.replace('_', ' ').title()}: {score:.2f}" for emotion, score in entry['emotions'].items()])
+        message_content += f"<br><br>Emotions: {emotion_text}"
+    
+    # Apply Arabic text styling
+    message_class = "message-content"
+    if entry['type'] == 'user' and entry.get('original_language') == 'arabic':
+        message_class += " arabic-text"
+    
+    # Unindented and free of blank lines so joined entries stay one HTML block each
+    return (
+        f'<div class="{css_class}">\n'
+        f'<div class="timestamp">{timestamp_str}</div>\n'
+        f'<div class="role-label">{role}</div>\n'
+        f'<div class="{message_class}">{message_content}</div>\n'
+        '</div>\n'
+    )
+
+def render_entries(entries):
+    """Emit a run of chat entries as one markdown element"""
+    blocks = []
+    for entry in entries:
+        message_html = entry.get('_html')
+        if message_html is None:
+            message_html = build_html(entry)
+            entry['_html'] = message_html
+        blocks.append(message_html)
+    st.markdown("".join(blocks), unsafe_allow_html=True)
+
+def render_chat():
+    """Conversation section, refreshed on its own while a chat is running"""
+    # On fragment reruns (driven by run_every), hold off until the handler records
+    # something new so idle ticks are cheap; full runs render immediately
+    ctx = get_script_run_ctx()
+    if ctx is not None and ctx.fragment_ids_this_run and 'websocket_handler' in st.session_state:
+        st.session_state.websocket_handler.wait_for_update(timeout=CHAT_REFRESH_TIMEOUT)
+
+    # Connection and chat lifetime changes affect controls outside this fragment
+    # and the run_every chosen by main(), so they need a full rerun
+    is_connected = 'websocket_handler' in st.session_state and st.session_state.websocket_handler.is_connected
+    chat_active = 'chat_future' in st.session_state and not st.session_state.chat_future.done()
+    state = (is_connected, chat_active)
+    if st.session_state.setdefault('last_chat_state', state) != state:
+        st.session_state.last_chat_state = state
+        st.rerun()
+
+    if 'websocket_handler' in st.session_state:
+        chat_history = st.session_state.websocket_handler.get_chat_history(limit=None)
+        
+        if chat_history:
+            earlier = chat_history[:-CHAT_VISIBLE_COUNT]
+            # Older entries are only serialized when asked for
+            if earlier and st.toggle(f"Show earlier messages ({len(earlier)})", key="show_earlier"):
+                render_entries(earlier)
+            render_entries(chat_history[-CHAT_VISIBLE_COUNT:])
+        else:
+            st.info("🎤 No conversation yet. Click '🎤 Start Voice Chat' and speak into your microphone.")
+    else:
+        st.info("🎤 Click '🎤 Start Voice Chat' to initialize voice recognition and start speaking.")
+
+def main():
+    st.set_page_config(page_title="Hume AI Voice Chat", page_icon="🎙️", layout="wide")
+
+    # Initialize session
+    if 'session_initialized' not in st.session_state:
+        if 'websocket_handler' in st.session_state:
+            del st.session_state.websocket_handler
+        if 'chat_future' in st.session_state:
+            del st.session_state.chat_future
+        if 'input_language' not in st.session_state:
+            st.session_state.input_language = 'auto'
+        st.session_state.session_initialized = True
+
+    # Custom CSS
+    st.markdown(custom_css(), unsafe_allow_html=True)
 
     # Load environment variables (works both locally and on Streamlit Cloud)
     api_key = os.getenv("HUME_API_KEY") or st.secrets.get("HUME_API_KEY")
@@ -370,83 +660,29 @@ def main():
             else:
                 st.session_state.websocket_handler.set_input_language(st.session_state.input_language)
             
-            if 'chat_thread' not in st.session_state or not st.session_state.chat_thread.is_alive():
-                st.session_state.chat_thread = threading.Thread(
-                    target=run_async_chat,
-                    args=(st.session_state.websocket_handler, api_key, secret_key, config_id)
+            if 'chat_future' not in st.session_state or st.session_state.chat_future.done():
+                st.session_state.chat_future = asyncio.run_coroutine_threadsafe(
+                    run_voice_chat(
+                        st.session_state.websocket_handler, api_key, secret_key, config_id,
+                        http_client=get_http_client()
+                    ),
+                    get_background_loop()
                 )
-                st.session_state.chat_thread.daemon = True
-                st.session_state.chat_thread.start()
                 st.success("🎤 Voice chat initiated! Attempting microphone access...")
                 st.rerun()
     
     with col4:
         if st.button("New Chat", use_container_width=True):
             if 'websocket_handler' in st.session_state:
-                st.session_state.websocket_handler.chat_history = []
+                st.session_state.websocket_handler.clear_history()
             st.success("New conversation started!")
             st.rerun()
 
     # Chat display
     st.markdown("### 🎙️ Voice Conversation")
     
-    if 'websocket_handler' in st.session_state:
-        chat_history = st.session_state.websocket_handler.get_chat_history()
-        
-        if chat_history:
-            for entry in chat_history:
-                timestamp_str = entry['timestamp'].strftime("%H:%M:%S")
-                
-                if entry['type'] == 'user':
-                    css_class = "chat-container user-message"
-                    role = "🗣️ You"
-                elif entry['type'] == 'assistant':
-                    css_class = "chat-container assistant-message"
-                    role = "🤖 AI Assistant"
-                elif entry['type'] == 'system':
-                    css_class = "chat-container system-message"
-                    role = "🔊 System"
-                elif entry['type'] == 'error':
-                    css_class = "chat-container error-message"
-                    role = "⚠️ Status"
-                else:
-                    css_class = "chat-container"
-                    role = entry['type'].title()
-                
-                # Build message content
-                message_content = entry['message']
-                
-                # Add translation for user messages
-                if entry['type'] == 'user':
-                    if entry.get('original_language') == 'arabic' and 'english_translation' in entry:
-                        message_content += f"\n\nEnglish: {entry['english_translation']}"
-                    elif entry.get('original_language') == 'english' and 'arabic_translation' in entry:
-                        message_content += f"\n\nArabic: {entry['arabic_translation']}"
-                
-                # Add emotions
-                if 'emotions' in entry and entry['emotions']:
-                    emotion_text = ' • '.join([f"{emotion.replace('_', ' ').title()}: {score:.2f}" for emotion, score in entry['emotions'].items()])
-                    message_content += f"\n\nEmotions: {emotion_text}"
-                
-                # Apply Arabic text styling
-                message_class = "message-content"
-                if entry['type'] == 'user' and entry.get('original_language') == 'arabic':
-                    message_class += " arabic-text"
-                
-                # Display message
-                message_html = f"""
-                <div class="{css_class}">
-                    <div class="timestamp">{timestamp_str}</div>
-                    <div class="role-label">{role}</div>
-                    <div class="{message_class}">{message_content}</div>
-                </div>
-                """
-                
-                st.markdown(message_html, unsafe_allow_html=True)
-        else:
-            st.info("🎤 No conversation yet. Click '🎤 Start Voice Chat' and speak into your microphone.")
-    else:
-        st.info("🎤 Click '🎤 Start Voice Chat' to initialize voice recognition and start speaking.")
+    chat_active = 'chat_future' in st.session_state and not st.session_state.chat_future.done()
+    st.fragment(render_chat, run_every=CHAT_REFRESH_TIMEOUT if chat_active else None)()
 
     # Instructions for audio usage
     if 'websocket_handler' in st.session_state and st.session_state.websocket_handler.is_connected:
@@ -465,11 +701,5 @@ def main():
             st.markdown("- Natural conversation flow")
             st.markdown("- Emotional tone in responses")
 
-    # Auto-refresh
-    if 'websocket_handler' in st.session_state and st.session_state.websocket_handler.is_connected:
-        import time
-        time.sleep(2)
-        st.rerun()
-
 if __name__ == "__main__":
     main()